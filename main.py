@@ -18,96 +18,140 @@ import argparse
 ### https://docs.python.org/3/library/os.html
 import os
 
-### PyPDF2 is a library for manipulating PDF files
-### It allows you to read, write, and manipulate PDF files in Python
-### https://pypdf2.readthedocs.io/en/latest/
-from PyPDF2 import PdfMerger
-
+### Gives access to the interpreter's standard streams (stdout, stderr, ...)
+### Used to write the rename messages to stdout in one go
+### https://docs.python.org/3/library/sys.html
+import sys
+
+### In-memory file objects, lets a PDF rendered to bytes be read back without writing it to disk
+### https://docs.python.org/3/library/io.html
+import io
+
+### concurrent.futures runs callables on a pool of worker threads/processes
+### Used to load several PDFs at the same time before merging them, and to convert files in parallel
+### https://docs.python.org/3/library/concurrent.futures.html
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+### repeat() yields the same value over and over, used to pass the same prefix/suffix to every executor.map() call
+### https://docs.python.org/3/library/itertools.html#itertools.repeat
+from itertools import repeat
+
+### Constants like string.punctuation, used to strip punctuation from words in the analyzer
+### https://docs.python.org/3/library/string.html
+import string
 
-### FPDF is a library for creating PDF files in Python
-### It allows you to create PDF documents from scratch, add text, images, and other elements
-### https://pyfpdf.readthedocs.io/en/latest/
-from fpdf import FPDF
+### functools provides lru_cache, used to cache the parser and the analyze results (see below)
+### https://docs.python.org/3/library/functools.html
+from functools import lru_cache
 
-import pdfplumber
-import string
+### Counter is a dict that counts how many times each item was added, used for the word frequency
+### https://docs.python.org/3/library/collections.html#collections.Counter
+from collections import Counter
 
-### Creates the main parser object. Think of this as the main entry point for the CLI (Think root node of the CLI tree)
-### Description is optional, but will appear when running --help
-parser = argparse.ArgumentParser(description="PyToolbox CLI Utility Suite")
-
-### This is where we setup the subcommands so we can create multiple tools in one toolbox/"tree"
-### The dest argumend specifies the name of the subcommand will be stored in args.comman
-subparsers = parser.add_subparsers(dest="command")
-
-
-### Here we register all of the subcommands.
-### The first argument is the name of the subcommand
-### The help argument is a short description of the subcommand when running --help
-### Each subcommand will have its own parser object and functionality
-# Rename command
-rename_parser = subparsers.add_parser("rename", help="Batch rename files or overwrite individual files")
-
-# Combine command
-combine_parser = subparsers.add_parser("combine", help="Combine PDF files")
-
-# Text Analyzer command
-analyzer_parser = subparsers.add_parser("analyze", help="Analyze a .txt file", description="If not flags are specified, all will be shown")
-
-# Clean command
-clean_parser = subparsers.add_parser("clean", help="Clean up files in a directory", description="Used to clean up files in a directory. Remove whitespce, remove special characters, etc.")
-### add_argument() tells the parser object what argument to expect when the subcommand is called
-### The first argument is the name of the argument
-### The help argument is a short description of the argument when running --help
-### The default argument is the default value of the argument if not specified
-### "--"" prefix means that the argument is optional
-### Action argument tells argparser what to do when the command is in CL
-### python main.py rename <directory> [options]
-rename_parser.add_argument("directory", help="Directory containing the files to rename")
-rename_parser.add_argument("--prefix", help="Prefix to add to each file", default="")
-rename_parser.add_argument("--suffix", help="Suffix to add to each file", default="")
-rename_parser.add_argument(
-    "--numbered", action="store_true", help="Add sequential numbering to filenames"
-)
-rename_parser.add_argument("--overwrite", nargs='+', help="Overwrite existing files, change the base name of the file (do not include extension)", default=None)
-rename_parser.add_argument("--txtpdfconvert", action="store_true", help="Convert .txt files to .pdf files or a .pdf file to .txt file", default=False)
-
-### This is the setup for the combine command
-### Adding arguments to the combine parser object
-### nargs is the number of arguments to be expected
-### The "+" means one or more arguments are expected
-combine_parser.add_argument(
-    "files", nargs="+", help="PDF files to combine (in order)"
-)
-combine_parser.add_argument(
-    "--output", default="combined.pdf", help="Name of the output file"
-)
-combine_parser.add_argument('--cover', default='Cover Page', help='Add a cover page to the combined PDF')
-
-### This is the setup for the analyzer command
-
-analyzer_parser.add_argument("file", help="Text file to analyze")
-analyzer_parser.add_argument("--freq", action="store_true", help="Show word frequency count")
-analyzer_parser.add_argument("--lines", action="store_true", help="Show total number of lines")
-analyzer_parser.add_argument("--words", action="store_true", help="Show total number of words")
-analyzer_parser.add_argument("--chars", action="store_true", help="Show total number of characters")
-analyzer_parser.add_argument("--unique", action="store_true", help="Show unique words only")
-
-
-clean_parser.add_argument("directory", help="Directory to clean up files")
-clean_parser.add_argument("--remove-whitespace", action="store_true", help="Remove whitespace from filenames")
-clean_parser.add_argument("--remove-special", action="store_true", help="Remove special characters from filenames")
+### heapq.nlargest() picks the top N items without sorting everything, itemgetter(1) sorts them by count
+### https://docs.python.org/3/library/heapq.html
+import heapq
+from operator import itemgetter
+
+### Reads and writes the analyze cache file
+### https://docs.python.org/3/library/json.html
+import json
+
+### Creates the temporary file the analyze cache is written to before it replaces the old one
+### https://docs.python.org/3/library/tempfile.html
+import tempfile
+
+### The PDF libraries (PyPDF2, fpdf, pypdfium2) are slow to import, so they are imported inside the
+### functions that use them. This way "analyze" or a plain "rename" doesn't pay for them at startup
+
+### lru_cache stores the result of a function call so it is only computed once
+### The parser tree is built on the first call to build_parser() and reused afterwards
+### https://docs.python.org/3/library/functools.html#functools.lru_cache
+@lru_cache(maxsize=1)
+def build_parser():
+    ### Creates the main parser object. Think of this as the main entry point for the CLI (Think root node of the CLI tree)
+    ### Description is optional, but will appear when running --help
+    parser = argparse.ArgumentParser(description="PyToolbox CLI Utility Suite")
+
+    ### This is where we setup the subcommands so we can create multiple tools in one toolbox/"tree"
+    ### The dest argumend specifies the name of the subcommand will be stored in args.comman
+    subparsers = parser.add_subparsers(dest="command")
+
+
+    ### Here we register all of the subcommands.
+    ### The first argument is the name of the subcommand
+    ### The help argument is a short description of the subcommand when running --help
+    ### Each subcommand will have its own parser object and functionality
+    # Rename command
+    rename_parser = subparsers.add_parser("rename", help="Batch rename files or overwrite individual files")
+
+    # Combine command
+    combine_parser = subparsers.add_parser("combine", help="Combine PDF files")
+
+    # Text Analyzer command
+    analyzer_parser = subparsers.add_parser("analyze", help="Analyze a .txt file", description="If not flags are specified, all will be shown")
+
+    # Clean command
+    clean_parser = subparsers.add_parser("clean", help="Clean up files in a directory", description="Used to clean up files in a directory. Remove whitespce, remove special characters, etc.")
+    ### add_argument() tells the parser object what argument to expect when the subcommand is called
+    ### The first argument is the name of the argument
+    ### The help argument is a short description of the argument when running --help
+    ### The default argument is the default value of the argument if not specified
+    ### "--"" prefix means that the argument is optional
+    ### Action argument tells argparser what to do when the command is in CL
+    ### python main.py rename <directory> [options]
+    rename_parser.add_argument("directory", help="Directory containing the files to rename")
+    rename_parser.add_argument("--prefix", help="Prefix to add to each file", default="")
+    rename_parser.add_argument("--suffix", help="Suffix to add to each file", default="")
+    rename_parser.add_argument(
+        "--numbered", action="store_true", help="Add sequential numbering to filenames"
+    )
+    rename_parser.add_argument("--overwrite", nargs='+', help="Overwrite existing files, change the base name of the file (do not include extension)", default=None)
+    rename_parser.add_argument("--txtpdfconvert", action="store_true", help="Convert .txt files to .pdf files or a .pdf file to .txt file", default=False)
+
+    ### This is the setup for the combine command
+    ### Adding arguments to the combine parser object
+    ### nargs is the number of arguments to be expected
+    ### The "+" means one or more arguments are expected
+    combine_parser.add_argument(
+        "files", nargs="+", help="PDF files to combine (in order)"
+    )
+    combine_parser.add_argument(
+        "--output", default="combined.pdf", help="Name of the output file"
+    )
+    combine_parser.add_argument('--cover', default='Cover Page', help='Add a cover page to the combined PDF')
+    combine_parser.add_argument("--no-outline", action="store_true", help="Don't copy the bookmarks (outline) of the input PDFs, faster for bookmarked PDFs")
+
+    ### This is the setup for the analyzer command
+
+    analyzer_parser.add_argument("file", help="Text file to analyze")
+    analyzer_parser.add_argument("--freq", action="store_true", help="Show word frequency count")
+    analyzer_parser.add_argument("--lines", action="store_true", help="Show total number of lines")
+    analyzer_parser.add_argument("--words", action="store_true", help="Show total number of words")
+    analyzer_parser.add_argument("--chars", action="store_true", help="Show total number of characters")
+    analyzer_parser.add_argument("--unique", action="store_true", help="Show unique words only")
+
+
+    clean_parser.add_argument("directory", help="Directory to clean up files")
+    clean_parser.add_argument("--remove-whitespace", action="store_true", help="Remove whitespace from filenames")
+    clean_parser.add_argument("--remove-special", action="store_true", help="Remove special characters from filenames")
+
+    return parser
 
 ### This function will be called when the rename command is executed
 # Function to handle the rename command
 def handle_rename(args):
     try:
         # Determine whether the input is a directory or a single file
+        # os.scandir() already knows each entry's type, so no extra stat() is needed per file
+        # Only the base names are kept, every rename happens inside this one directory
         if os.path.isdir(args.directory):
-            files = os.listdir(args.directory)
-            files = [os.path.join(args.directory, f) for f in files]
+            directory = args.directory
+            with os.scandir(directory) as it:
+                files = [entry.name for entry in it if entry.is_file()]
         elif os.path.isfile(args.directory):
-            files = [args.directory]
+            directory = os.path.dirname(args.directory) or "."
+            files = [os.path.basename(args.directory)]
         else:
             print(f"Path not found: {args.directory}")
             return
@@ -117,149 +161,320 @@ def handle_rename(args):
         return
 
 
-    for idx, filepath in enumerate(files):
-        # Skip subdirectories or non-files
-        if not os.path.isfile(filepath):
-            continue
+    ### Open the directory once and rename relative to it, so the kernel doesn't resolve the full path on every rename
+    ### dir_fd is not available on every platform (e.g. Windows), in that case fall back to full paths
+    dir_fd = None
+    if os.rename in os.supports_dir_fd:
+        dir_fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        _rename_files(args, directory, files, dir_fd)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+
+# Helper used by handle_rename, renames (and optionally converts) every file in the directory
+def _rename_files(args, directory, files, dir_fd):
+    # Check the overwrite names once, there has to be exactly one non-empty name per file
+    if args.overwrite:
+        if len(args.overwrite) != len(files):
+            print(f"Error: Overwrite name must be the same length as the number of files")
+            return
+        if any(not new_base for new_base in args.overwrite):
+            print(f"Error: Overwrite name cannot be empty")
+            return
 
-        name, ext = os.path.splitext(os.path.basename(filepath))
-        if args.overwrite and idx < len(args.overwrite):
-            if args.overwrite[idx] is None:
-                print(f"Error: Overwrite name cannot be None")
-                return
-            elif args.overwrite[idx] == "":
-                print(f"Error: Overwrite name cannot be empty")
-                return
-            elif len(args.overwrite) != len(files):
-                print(f"Error: Overwrite name must be the same length as the number of files")
-                return
-            new_base = args.overwrite[idx]
-        else:
-            new_base = name
-        new_name = f"{args.prefix}{new_base}{args.suffix}{ext}"
-        # If numbering is enabled, it overrides both name and overwrite
-        if args.numbered:
-            new_name = f"{args.prefix}{idx+1}{args.suffix}{ext}"
-
-        # Build the new path in the same directory
-        new_path = os.path.join(os.path.dirname(filepath), new_name)
-
-        # Check if the file is a .txt file and if the user wants to convert it to .pdf
-        if args.txtpdfconvert and ext.lower() == ".txt":
-            pdf = FPDF() # Create a PDF object
-            pdf.add_page() # Add a page to the PDF
-            pdf.set_font("Arial", size = 15) # Set the font and size
-            
-            # Read the .txt file and add its content to the PDF
-            with open(filepath, "r", encoding="utf-8") as f:
-                for line in f:
-                    pdf.cell(200, 10, txt=line.encode('latin-1', 'replace').decode('latin-1'), ln=True) # Add content to the PDF
-            output_dir = "./output_pdf" # Create the output directory
-            os.makedirs(output_dir, exist_ok=True) # Create the output directory if it doesn't exist
-            output_pdf = os.path.join(output_dir, f"{args.prefix}{name}{args.suffix}.pdf") # Create the output PDF name
-            pdf.output(output_pdf) # Create the PDF file
-
-        # Check if the file is a .pdf file and if the user wants to convert it to .txt
-        elif args.txtpdfconvert and ext.lower() == ".pdf":
-            with pdfplumber.open(filepath) as pdf: # Open the PDF file
-                text = "" # Initialize an empty string to store the text
-                for page in pdf.pages: # Iterate through each page of the PDF
-                    text += page.extract_text() # Extract text from the page
-            output_dir = "./output_txt"
-            os.makedirs(output_dir, exist_ok=True)
-            output_txt = os.path.join(output_dir, f"{args.prefix}{name}{args.suffix}.txt") # Create the output .txt name
-            # Write the extracted text to a .txt file
-            with open(output_txt, "w", encoding="utf-8") as f:
-                f.write(text)
-
-
-        os.rename(filepath, new_path)
-        print(f"Renamed '{os.path.basename(filepath)}' -> '{new_name}'")
+    # Local variables are faster to look up than attributes of args inside the loop
+    prefix = args.prefix
+    suffix = args.suffix
+    overwrite = args.overwrite
+
+    ### The naming mode doesn't change between files, so the function building the new name is picked once here
+    # If numbering is enabled, it overrides both name and overwrite
+    if args.numbered:
+        make_name = lambda idx, name, ext: "".join((prefix, str(idx + 1), suffix, ext))
+    elif overwrite:
+        make_name = lambda idx, name, ext: "".join((prefix, overwrite[idx], suffix, ext))
+    else:
+        make_name = lambda idx, name, ext: "".join((prefix, name, suffix, ext))
+
+    renames = []
+    for idx, filename in enumerate(files):
+        name, ext = os.path.splitext(filename)
+        renames.append((filename, make_name(idx, name, ext)))
+
+    ### Every conversion is independent and CPU heavy, so they run on a pool of worker processes
+    ### This has to finish before renaming, the workers read the files by their old name
+    if args.txtpdfconvert:
+        to_convert = [filename for filename in files if os.path.splitext(filename)[1].lower() in (".txt", ".pdf")]
+        if to_convert:
+            filepaths = [os.path.join(directory, filename) for filename in to_convert]
+            names, exts = zip(*(os.path.splitext(filename) for filename in to_convert))
+            with ProcessPoolExecutor() as executor:
+                list(executor.map(_convert_one, filepaths, repeat(args.prefix), repeat(args.suffix), names, exts))
+
+    # Renaming stays sequential since every rename touches the same directory
+    # The messages are collected and written in one go instead of one print() per file
+    out = []
+    try:
+        for filename, new_name in renames:
+            # Rename the file in the same directory
+            if dir_fd is not None:
+                os.rename(filename, new_name, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+            else:
+                os.rename(os.path.join(directory, filename), os.path.join(directory, new_name))
+            out.append(f"Renamed '{filename}' -> '{new_name}'")
+    finally:
+        # Still report the renames that happened if one of them fails
+        if out:
+            sys.stdout.write("\n".join(out) + "\n")
+
+
+# Converts a single .txt file to .pdf or a .pdf file to .txt, runs in a worker process
+# Returns the path of the file that was created
+def _convert_one(filepath, prefix, suffix, name, ext):
+    # Check if the file is a .txt file and convert it to .pdf
+    if ext.lower() == ".txt":
+        ### FPDF is a library for creating PDF files in Python
+        ### It allows you to create PDF documents from scratch, add text, images, and other elements
+        ### https://pyfpdf.readthedocs.io/en/latest/
+        from fpdf import FPDF
+
+        pdf = FPDF() # Create a PDF object
+        pdf.add_page() # Add a page to the PDF
+        pdf.set_font("Arial", size = 15) # Set the font and size
+
+        # Read the .txt file and add its content to the PDF
+        # FPDF core fonts only support latin-1, so the text is transcoded once instead of once per line
+        with open(filepath, "r", encoding="utf-8") as f:
+            text = f.read().encode('latin-1', 'replace').decode('latin-1')
+        # multi_cell() lays out the whole text in one call, breaking on newlines (and wrapping long lines)
+        pdf.multi_cell(0, 10, txt=text, align='L') # Add content to the PDF
+        output_dir = "./output_pdf" # Create the output directory
+        os.makedirs(output_dir, exist_ok=True) # Create the output directory if it doesn't exist
+        output_pdf = os.path.join(output_dir, f"{prefix}{name}{suffix}.pdf") # Create the output PDF name
+        # Render the PDF to a string and write it ourselves, in one write
+        buf = pdf.output(dest="S").encode("latin-1")
+        with open(output_pdf, "wb") as f:
+            f.write(buf) # Create the PDF file
+        return output_pdf
+
+    # Otherwise it is a .pdf file, convert it to .txt
+    ### pypdfium2 is a binding to PDFium, the C++ PDF engine used by Chrome (pdfplumber is built on top of it)
+    ### Its text extraction runs in C, without building a full layout tree like pdfplumber does
+    ### https://pypdfium2.readthedocs.io/en/stable/
+    import pypdfium2 as pdfium
+
+    pdf_doc = pdfium.PdfDocument(filepath) # Open the PDF file
+    try:
+        # Extract the text of every page and join them once at the end
+        # PDFium separates lines with "\r\n", normalize them so the .txt file has plain newlines
+        text = "\n".join(page.get_textpage().get_text_bounded() for page in pdf_doc).replace("\r\n", "\n")
+    finally:
+        pdf_doc.close()
+    output_dir = "./output_txt"
+    os.makedirs(output_dir, exist_ok=True)
+    output_txt = os.path.join(output_dir, f"{prefix}{name}{suffix}.txt") # Create the output .txt name
+    # Write the extracted text to a .txt file
+    with open(output_txt, "w", encoding="utf-8") as f:
+        f.write(text)
+    return output_txt
+
+
+# Helper used by handle_combine, opens a single PDF on a worker thread
+# Returns (file, reader, error) so errors can be printed on the main thread
+def _load_pdf(file):
+    from PyPDF2 import PdfReader
 
+    try:
+        # strict=False skips the extra validation done while parsing the xref table and objects
+        return file, PdfReader(file, strict=False), None
+    except Exception as e:
+        return file, None, e
 
 
 # Function to handle the combine command
 def handle_combine(args):
-
-    ### Creates a PdfMerger object to handle the merging
+    ### PyPDF2 is a library for manipulating PDF files
+    ### It allows you to read, write, and manipulate PDF files in Python
+    ### PdfWriter.append() copies the pages of each input into a single object table (PdfMerger is deprecated)
+    ### https://pypdf2.readthedocs.io/en/latest/
+    from PyPDF2 import PdfReader, PdfWriter
+    from fpdf import FPDF
+
+    ### Creates a PdfWriter object to handle the merging
     # Initialize object
-    merger = PdfMerger()
+    writer = PdfWriter()
     if args.cover:
         # Create a cover page if the --cover flag is set
         cover_pdf = FPDF()
         cover_pdf.add_page()
         cover_pdf.set_font("Arial", size=24)
         cover_pdf.cell(200, 10, txt=args.cover, ln=True, align='C')
-        cover_pdf.output("cover.pdf")
-    merger.append("cover.pdf")
+        # The cover is rendered in memory and read back from there, no temporary cover.pdf file is needed
+        cover_bytes = cover_pdf.output(dest="S").encode("latin-1")
+        writer.append(PdfReader(io.BytesIO(cover_bytes)))
     # Skip the non-PDF files
+    pdfs = []
     for file in args.files:
         if not file.endswith(".pdf"):
             print(f"Skipping non-PDF: {file}")
             continue
-        
-        # Attemps to append each file to the merger
+        pdfs.append(file)
+
+    ### Reading/parsing each PDF is independent, so the readers are loaded in parallel
+    ### PdfWriter is not thread-safe, so the actual appending stays sequential (and in order)
+    # Load every PDF on a worker thread, errors are returned instead of raised
+    if pdfs:
+        with ThreadPoolExecutor(max_workers=min(8, len(pdfs))) as executor:
+            results = list(executor.map(_load_pdf, pdfs))
+    else:
+        results = []
+
+    # Attemps to append each loaded file to the writer
+    for file, reader, error in results:
+        if isinstance(error, FileNotFoundError): # File not found
+            print(f"File not found: {file}")
+            continue
+        elif error is not None: # General exception handling
+            # Handles other exceptions (e.g., file not readable)
+            print(f"Error adding {file}: {error}")
+            continue
         try:
-            merger.append(file)
+            # Skipping the outline avoids walking the whole /Outlines tree of each input
+            writer.append(reader, import_outline=not args.no_outline)
             print(f"Added: {file}")
-        except FileNotFoundError: # File not found
-            print(f"File not found: {file}")
         except Exception as e: # General exception handling
-            # Handles other exceptions (e.g., file not readable)
             print(f"Error adding {file}: {e}")
 
-    ### merger.write() writes the merged PDF to the specified output file
-    ### merger.close() closes the merger object
-    ### This is important to free up resources and finalize the output file
+    ### writer.write() writes the merged PDF to the specified output file
+    ### The file is opened here so the writer streams straight into it
     # Attempt to write the merged PDF to the output file
     try:
-        merger.write(args.output)
-        if args.cover and os.path.exists("cover.pdf"):
-            os.remove("cover.pdf")
-        merger.close()
+        with open(args.output, "wb") as f:
+            writer.write(f)
         print(f"Combined PDF saved as: {args.output}") # Output message
     except Exception as e: # General exception handling
         print(f"Failed to write output PDF: {e}")
 
-from collections import Counter
+### Results of the analyze command are cached on disk, keyed by the file's path, modification time and size
+### If the file hasn't changed since the last run, the stats are printed straight from the cache
+### Only the counts and the top 10 words are stored, the unique words are never written to disk
+ANALYZE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "pytoolbox", "analyze.json")
+ANALYZE_CACHE_MAX_ENTRIES = 256
+_CACHED_FIELDS = ("lines", "words", "chars", "top")
+
+# Reads the on-disk analyze cache
+def _read_analyze_cache():
+    try:
+        with open(ANALYZE_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError): # Missing or corrupt cache, start over
+        return {}
+    # Valid JSON that isn't the expected {key: {stats}} layout counts as corrupt too
+    if not isinstance(cache, dict):
+        return {}
+    return {key: entry for key, entry in cache.items() if isinstance(entry, dict)}
+
+# Same as above, but only read once per process for lookups
+@lru_cache(maxsize=1)
+def _load_analyze_cache():
+    return _read_analyze_cache()
+
+# Adds the stats of one file to the on-disk cache, failing to do so is not an error
+def _save_analyze_cache(key, path, stats):
+    # Re-read the cache so entries written by other runs in the meantime are kept
+    cache = _read_analyze_cache()
+    entry = {**cache.get(key, {}), **{field: stats[field] for field in _CACHED_FIELDS if field in stats}}
+
+    # Drop older versions of this file, then keep only the newest entries
+    abspath = os.path.abspath(path)
+    cache = {k: v for k, v in cache.items() if k.rsplit(":", 2)[0] != abspath}
+    cache[key] = entry
+    cache = dict(list(cache.items())[-ANALYZE_CACHE_MAX_ENTRIES:])
+
+    # Write to a temporary file and swap it in, so a concurrent run never sees a half-written cache
+    try:
+        cache_dir = os.path.dirname(ANALYZE_CACHE_PATH)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, ANALYZE_CACHE_PATH)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass
+
+# Reads the file and computes its stats, word frequency and unique words are only computed if asked for
+def _count_file(path, freq, unique):
+    n_lines = n_words = n_chars = 0
+    counter = Counter()
+    unique_words = set()
+    # Open the file in read mode and stream it one line at a time
+    # Only the counters are kept in memory, never the whole text or word list
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            words_in_line = line.split()
+            # splitlines() also breaks on characters like \f or \u2028, which file iteration doesn't
+            n_lines += len(line.splitlines())
+            n_words += len(words_in_line)
+            n_chars += len(line)
+            # Count the frequency of each word
+            if freq:
+                counter.update(words_in_line)
+            if unique:
+                unique_words.update(word.strip(string.punctuation).lower() for word in words_in_line)
+
+    stats = {"lines": n_lines, "words": n_words, "chars": n_chars}
+    if freq:
+        # Only the top 10 are needed, so a heap of size 10 is used instead of sorting every word
+        stats["top"] = heapq.nlargest(10, counter.items(), key=itemgetter(1))
+    if unique:
+        stats["unique"] = sorted(unique_words)
+    return stats
+
+# Returns the stats for a file, from memory or the on-disk cache when possible
+# key is "<absolute path>:<mtime in ns>:<size>", so an edited file never matches an old entry
+@lru_cache(maxsize=32)
+def _analyze_stats(key, path, freq, unique):
+    stats = _load_analyze_cache().get(key, {})
+    # The unique words only live in memory (this lru_cache), so asking for them always reads the file
+    if not unique and "lines" in stats and (not freq or "top" in stats):
+        return stats
+
+    stats = {**stats, **_count_file(path, freq, unique)}
+    _save_analyze_cache(key, path, stats)
+    return stats
 
 def handle_analyze(args):
+    if not (args.freq or args.lines or args.words or args.chars or args.unique):
+        args.freq = args.lines = args.words = args.chars = True
+
     try:
-        # Open the file in read mode and save the file in text
-        with open(args.file, "r", encoding="utf-8") as f:
-            text = f.read()
+        st = os.stat(args.file)
+        key = f"{os.path.abspath(args.file)}:{st.st_mtime_ns}:{st.st_size}"
+        stats = _analyze_stats(key, args.file, args.freq, args.unique)
     except FileNotFoundError: # General exception handling
         print(f"File not found: {args.file}")
         return
 
-    # Split the text into lines, words, and characters
-    lines = text.splitlines()
-    words = text.split()
-    chars = len(text)
-
-    # Count the frequency of each word
-    freq = Counter(words)
-
-    if not (args.freq or args.lines or args.words or args.chars or args.unique):
-        args.freq = args.lines = args.words = args.chars = True
-
     if args.lines:
-        print(f"Total lines: {len(lines)}")
+        print(f"Total lines: {stats['lines']}")
     if args.words:
-        print(f"Total words: {len(words)}")
+        print(f"Total words: {stats['words']}")
     if args.chars:
-        print(f"Total characters: {chars}")
+        print(f"Total characters: {stats['chars']}")
     if args.freq:
         print("\nTop 10 most common words:")
-        for word, count in freq.most_common(10):
+        for word, count in stats["top"]:
             print(f"{word}: {count}")
     if args.unique:
-        unique_words = set()
-        for word in words:
-            unique_words.add(word.strip(string.punctuation).lower())
-        print(f"\nTotal unique words: {len(unique_words)}")
+        print(f"\nTotal unique words: {len(stats['unique'])}")
         print("Unique words:")
-        for word in sorted(unique_words):
+        for word in stats["unique"]:
             print(word)
 
 def handle_clean(args):
@@ -318,14 +533,15 @@ def handle_clean(args):
 
 
 # Main function to handle the command-line interface
-args = parser.parse_args()
-
-# Check if a command was provided
-if args.command == "rename":
-    handle_rename(args)
-elif args.command == "combine":
-    handle_combine(args)
-elif args.command == "analyze":
-    handle_analyze(args)
-elif args.command == "clean":
-    handle_clean(args)
\ No newline at end of file
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+
+    # Check if a command was provided
+    if args.command == "rename":
+        handle_rename(args)
+    elif args.command == "combine":
+        handle_combine(args)
+    elif args.command == "analyze":
+        handle_analyze(args)
+    elif args.command == "clean":
+        handle_clean(args)